@@ -0,0 +1,51 @@
+"""
+Shared pytest fixtures
+"""
+import pytest
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The Flask app, imported and configured once per test session"""
+    from server import app as _app
+    _app.config.update(TESTING=True)
+    return _app
+
+
+@pytest.fixture(scope="session")
+def session_client(app):
+    """A single test client shared by the whole session"""
+    return app.test_client()
+
+
+@pytest.fixture
+def client(app, session_client):
+    """The shared test client, logged out at the start of every test"""
+    session_client.delete_cookie(app.config['SESSION_COOKIE_NAME'])
+    return session_client
+
+
+@pytest.fixture(scope="session")
+def blank_monitor():
+    """An unauthenticated RingMonitor with empty credentials, built once per session"""
+    from ring_monitor import RingMonitor
+    return RingMonitor({
+        'ring': {
+            'username': '',
+            'password': '',
+            'refresh_token': '',
+            'otp_code': ''
+        },
+        'monitoring': {
+            'poll_interval_seconds': 60,
+            'keywords': ['test'],
+            'emojis': []
+        }
+    })
+
+
+@pytest.fixture(scope="session")
+def headless_auth():
+    """A headless RingBrowserAuth, built once per session (the browser is never started)"""
+    from ring_browser_auth import RingBrowserAuth
+    return RingBrowserAuth(headless=True)
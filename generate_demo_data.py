@@ -122,9 +122,9 @@ def main():
     emoji_counts = {}
     
     for match in matches:
-        for kw in match['matched_keywords']:
+        for kw in match.matched_keywords:
             keyword_counts[kw] = keyword_counts.get(kw, 0) + 1
-        for emoji in match['matched_emojis']:
+        for emoji in match.matched_emojis:
             emoji_counts[emoji] = emoji_counts.get(emoji, 0) + 1
     
     print("\nKeyword Matches:")
@@ -7,7 +7,6 @@ import logging
 import asyncio
 from typing import Optional, Dict
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext
-from urllib.parse import urlparse
 import time
 
 logging.basicConfig(level=logging.INFO)
@@ -21,6 +20,7 @@ class RingBrowserAuth:
     RING_LOGIN_URL = "https://account.ring.com/account/login"
     RING_OAUTH_URL = "https://oauth.ring.com/oauth/token"
     RING_DASHBOARD_URL = "https://account.ring.com/dashboard"
+    RING_ACCOUNT_ORIGIN = "https://account.ring.com/"
     
     def __init__(self, headless: bool = True):
         """
@@ -33,6 +33,16 @@ class RingBrowserAuth:
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+    
+    @classmethod
+    def is_dashboard_url(cls, url: str) -> bool:
+        """Check whether the browser has landed on the Ring dashboard (i.e. login succeeded)"""
+        # The '/' after the host pins it, so a prefix check stands in for parsing the hostname
+        if not url.startswith(cls.RING_ACCOUNT_ORIGIN):
+            return False
+        # Any dashboard page counts (e.g. /account/dashboard), but not a login page under it
+        path = url[len(cls.RING_ACCOUNT_ORIGIN):].partition('?')[0].partition('#')[0]
+        return 'dashboard' in path and 'login' not in path
         
     async def start_browser(self):
         """Start the browser instance"""
@@ -71,13 +81,9 @@ class RingBrowserAuth:
         # Wait for redirect to dashboard or successful login indicator
         while time.time() - start_time < timeout_seconds:
             current_url = self.page.url
-            parsed_url = urlparse(current_url)
             
-            # Check if we've been redirected to Ring's account domain (successful login)
-            # Verify we're on the right domain and not on the login page
-            if (parsed_url.hostname == "account.ring.com" and 
-                "dashboard" in parsed_url.path and 
-                "login" not in parsed_url.path):
+            # Check if we've been redirected to Ring's dashboard (successful login)
+            if self.is_dashboard_url(current_url):
                 logger.info(f"Authentication successful! Redirected to: {current_url}")
                 break
                 
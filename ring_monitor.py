@@ -3,12 +3,18 @@ Ring Neighborhood Monitor
 Monitors Ring neighborhood posts for specified keywords and emojis
 """
 import json
-import time
+import math
+import sys
 import logging
+import threading
+from collections import defaultdict, namedtuple
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Set
+from typing import List, Dict, Optional, Sequence, Tuple
 import re
 
+import numpy as np
+
 try:
     from ring_doorbell import Ring, Auth
 except ImportError:
@@ -16,22 +22,135 @@ except ImportError:
     Ring = None
     Auth = None
 
+try:
+    import hyperscan
+except ImportError:
+    # Fall back to pyahocorasick when Hyperscan is not available
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:
+    # Fall back to a single regex alternation when pyahocorasick is not available
+    ahocorasick = None
+
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:
+    # Remember seen post ids exactly (in a set) when pybloom_live is not available
+    ScalableBloomFilter = None
+
+try:
+    from ring_monitor_core import scan_batch
+except ImportError:
+    # Run the same scan loop in Python when the Cython extension has not been built
+    def scan_batch(texts, keywords, emojis, find):
+        """Return (matched_keywords, matched_emojis) for each lowercased post text, in configured order"""
+        results = []
+        for text in texts:
+            # Without a matcher, substring checks against the text itself stand in for the hit set
+            hits = text if find is None else find(text)
+            results.append((tuple(kw for kw in keywords if kw in hits),
+                            tuple(emoji for emoji in emojis if emoji in hits)))
+        return results
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# A poll's posts in columnar form: parallel lists plus an (N, 2) float32 array of (latitude, longitude)
+PostBatch = namedtuple('PostBatch', 'ids titles texts timestamps coords addresses')
+
+
+@dataclass(slots=True)
+class Match:
+    """A post that contained at least one configured keyword or emoji"""
+    id: str
+    timestamp: str
+    title: str
+    text: str
+    latitude: Optional[float]
+    longitude: Optional[float]
+    address: str
+    matched_keywords: Tuple[str, ...]
+    matched_emojis: Tuple[str, ...]
+    detected_at: str
+    
+    def as_dict(self) -> Dict:
+        """Return the nested JSON shape served by the API and broadcast over SocketIO"""
+        return {
+            'id': self.id,
+            'timestamp': self.timestamp,
+            'title': self.title,
+            'text': self.text,
+            'location': {
+                'latitude': self.latitude,
+                'longitude': self.longitude,
+                'address': self.address
+            },
+            'matched_keywords': list(self.matched_keywords),
+            'matched_emojis': list(self.matched_emojis),
+            'detected_at': self.detected_at
+        }
+
+
+# float32 resolves lat/lon to ~1 m, so coordinates are stored as float32 and
+# rounded back to this many decimals (~1 m) when a match is reported
+COORD_DTYPE = np.float32
+COORD_DECIMALS = 5
+
+
+def _coordinate(value) -> float:
+    """Coerce a raw coordinate to float, or NaN when the post carries something unusable"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _to_soa(posts: Sequence[Dict]) -> PostBatch:
+    """Convert Ring post dicts into a PostBatch, applying the same defaults as a per-post lookup"""
+    now = datetime.now().isoformat()
+    return PostBatch(
+        ids=[post.get('id', str(hash(str(post)))) for post in posts],
+        titles=[post.get('title', '') for post in posts],
+        texts=[post.get('text', '') for post in posts],
+        timestamps=[post.get('created_at', now) for post in posts],
+        coords=np.array([(_coordinate(post.get('latitude', 0)), _coordinate(post.get('longitude', 0)))
+                         for post in posts],
+                        dtype=COORD_DTYPE).reshape(-1, 2),
+        addresses=[post.get('address', 'Unknown') for post in posts],
+    )
+
 
 class RingMonitor:
     """Monitors Ring neighborhood posts for keywords and emojis"""
     
+    # Sizing for the seen-post Bloom filter; it grows in stages past the initial capacity
+    SEEN_POSTS_CAPACITY = 10_000
+    SEEN_POSTS_ERROR_RATE = 1e-4
+    
     def __init__(self, config: Dict):
         self.config = config
-        self.keywords = [kw.lower() for kw in config['monitoring']['keywords']]
-        self.emojis = config['monitoring']['emojis']
+        # Interned so every match shares the configured term objects; empty terms would
+        # match every post, so they are dropped here for every search backend alike
+        self.keywords = [sys.intern(kw.lower()) for kw in config['monitoring']['keywords'] if kw]
+        self.emojis = [sys.intern(emoji) for emoji in config['monitoring']['emojis'] if emoji]
+        # Immutable snapshots the matcher iterates on every post
+        self._keyword_terms = tuple(self.keywords)
+        self._emoji_terms = tuple(self.emojis)
         self.poll_interval = config['monitoring']['poll_interval_seconds']
-        self.seen_posts: Set[str] = set()
-        self.matches: List[Dict] = []
+        self.seen_posts = self._new_seen_posts()
+        self.matches: List[Match] = []
+        # Term -> positions in self.matches, filled in lazily by _index_matches. The
+        # positions stay valid because matches is append-only; reset_state is the only
+        # way to clear it
+        self._keyword_index = defaultdict(list)
+        self._emoji_index = defaultdict(list)
+        self._indexed = 0
+        self._index_lock = threading.Lock()
         self.ring = None
         self.auth = None
+        self._matcher = self._build_matcher()
     
     @property
     def is_authenticated(self):
@@ -218,61 +337,160 @@ class RingMonitor:
         # Return empty list in production, or mock data for development
         return []
     
-    def check_for_matches(self, posts: List[Dict]) -> List[Dict]:
+    def reset_state(self):
+        """Forget seen posts and stored matches, keeping the compiled matcher and configuration"""
+        with self._index_lock:
+            self.seen_posts = self._new_seen_posts()
+            self.matches.clear()
+            self._keyword_index.clear()
+            self._emoji_index.clear()
+            self._indexed = 0
+    
+    @classmethod
+    def _new_seen_posts(cls):
+        """Create the store of already-processed post ids.
+        
+        A long-running monitor sees every post id forever, so a scalable Bloom
+        filter (~19 bits per id at this error rate, since each stage is sized
+        tighter than the overall target) is used instead of a set of strings.
+        A false positive skips an unseen post with probability SEEN_POSTS_ERROR_RATE.
+        """
+        if ScalableBloomFilter is None:
+            return set()
+        return ScalableBloomFilter(initial_capacity=cls.SEEN_POSTS_CAPACITY,
+                                   error_rate=cls.SEEN_POSTS_ERROR_RATE)
+    
+    def _build_matcher(self):
+        """Compile every keyword and emoji into the fastest available multi-term search.
+        
+        Returns a function mapping lowercased post text to the set of terms it
+        contains, or None when there are no terms to search for.
+        """
+        terms = sorted(set(self._keyword_terms + self._emoji_terms))
+        if not terms:
+            return None
+        if hyperscan is not None:
+            return self._hyperscan_matcher(terms)
+        if ahocorasick is not None:
+            return self._automaton_matcher(terms)
+        return self._regex_matcher(terms)
+    
+    @staticmethod
+    def _hyperscan_matcher(terms: List[str]):
+        """Scan UTF-8 post text against a Hyperscan block-mode database of literal terms"""
+        # Hex-escape every byte so each term is matched literally, never as a regex
+        expressions = [b''.join(b'\\x%02x' % byte for byte in term.encode('utf-8')) for term in terms]
+        database = hyperscan.Database()
+        database.compile(expressions=expressions,
+                         ids=list(range(len(terms))),
+                         elements=len(terms),
+                         flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(terms))
+        # Scratch space is per database and reused; check_for_matches runs on one thread
+        scratch = hyperscan.Scratch(database)
+        
+        def find(full_text):
+            hits = set()
+            
+            def on_match(term_id, start, end, flags, context):
+                hits.add(terms[term_id])
+            
+            database.scan(full_text.encode('utf-8'), match_event_handler=on_match, scratch=scratch)
+            return hits
+        
+        return find
+    
+    @staticmethod
+    def _automaton_matcher(terms: List[str]):
+        """Scan post text with a single pyahocorasick automaton holding every term"""
+        automaton = ahocorasick.Automaton()
+        for term in terms:
+            automaton.add_word(term, term)
+        automaton.make_automaton()
+        
+        def find(full_text):
+            return {term for _, term in automaton.iter(full_text)}
+        
+        return find
+    
+    @staticmethod
+    def _regex_matcher(terms: List[str]):
+        """Scan post text with one compiled alternation of every term"""
+        # Longest first, inside a lookahead so every start position is tried and matches may overlap
+        alternation = '|'.join(map(re.escape, sorted(terms, key=len, reverse=True)))
+        pattern = re.compile(f'(?=({alternation}))')
+        # Only the longest term is reported at each position, so expand hits to the terms they start with
+        prefixes = {term: {other for other in terms if term.startswith(other)} for term in terms}
+        
+        def find(full_text):
+            return set().union(*(prefixes[hit] for hit in pattern.findall(full_text)))
+        
+        return find
+    
+    def _match_terms(self, full_text: str):
+        """Return (matched_keywords, matched_emojis) for lowercased post text, in configured order"""
+        return scan_batch([full_text], self._keyword_terms, self._emoji_terms, self._matcher)[0]
+    
+    def check_for_matches(self, posts: Sequence[Dict]) -> List[Match]:
         """Check posts for keyword and emoji matches"""
+        return self.check_for_matches_soa(_to_soa(posts))
+    
+    def check_for_matches_soa(self, batch: PostBatch) -> List[Match]:
+        """Check a columnar batch of posts for keyword and emoji matches"""
         new_matches = []
+        titles, texts, coords = batch.titles, batch.texts, batch.coords
         
-        for post in posts:
-            post_id = post.get('id', str(hash(str(post))))
-            
+        candidates = []
+        for i, post_id in enumerate(batch.ids):
             # Skip if we've already seen this post
             if post_id in self.seen_posts:
                 continue
                 
             self.seen_posts.add(post_id)
-            
-            # Extract text content
-            text = post.get('text', '').lower()
-            title = post.get('title', '').lower()
-            full_text = f"{title} {text}"
-            
-            # Check for keyword matches
-            matched_keywords = [kw for kw in self.keywords if kw in full_text]
-            
-            # Check for emoji matches
-            matched_emojis = [emoji for emoji in self.emojis if emoji in full_text]
-            
+            candidates.append(i)
+        
+        # Extract text content, lowercased in a single pass, and scan it all in one call
+        full_texts = [f"{titles[i]} {texts[i]}".lower() for i in candidates]
+        scanned = scan_batch(full_texts, self._keyword_terms, self._emoji_terms, self._matcher)
+        
+        for i, (matched_keywords, matched_emojis) in zip(candidates, scanned):
             if matched_keywords or matched_emojis:
-                match = {
-                    'id': post_id,
-                    'timestamp': post.get('created_at', datetime.now().isoformat()),
-                    'title': post.get('title', ''),
-                    'text': post.get('text', ''),
-                    'location': {
-                        'latitude': post.get('latitude', 0),
-                        'longitude': post.get('longitude', 0),
-                        'address': post.get('address', 'Unknown')
-                    },
-                    'matched_keywords': matched_keywords,
-                    'matched_emojis': matched_emojis,
-                    'detected_at': datetime.now().isoformat()
-                }
+                post_id = batch.ids[i]
+                # Missing or unparseable coordinates are NaN in the batch; report them as null
+                latitude, longitude = (round(value, COORD_DECIMALS) if math.isfinite(value) else None
+                                       for value in coords[i].tolist())
+                match = Match(
+                    id=post_id,
+                    timestamp=batch.timestamps[i],
+                    title=titles[i],
+                    text=texts[i],
+                    latitude=latitude,
+                    longitude=longitude,
+                    address=batch.addresses[i],
+                    matched_keywords=matched_keywords,
+                    matched_emojis=matched_emojis,
+                    detected_at=datetime.now().isoformat()
+                )
                 
                 new_matches.append(match)
                 logger.info(f"Match found: {matched_keywords + matched_emojis} in post {post_id}")
                 
         return new_matches
     
-    def start_monitoring(self, callback=None):
-        """Start continuous monitoring loop"""
+    def start_monitoring(self, callback=None, stop_event=None):
+        """Start continuous monitoring loop, polling until stop_event (if given) is set"""
         logger.info("Starting Ring neighborhood monitoring...")
         
+        if stop_event is None:
+            stop_event = threading.Event()
+        
         if not self.authenticate():
             logger.warning("Running in mock mode without Ring authentication")
         
-        while True:
+        while not stop_event.is_set():
             try:
                 posts = self.get_neighborhood_posts()
+                if stop_event.is_set():
+                    break
                 new_matches = self.check_for_matches(posts)
                 
                 if new_matches:
@@ -284,28 +502,38 @@ class RingMonitor:
                         for match in new_matches:
                             callback(match)
                 
-                time.sleep(self.poll_interval)
+                stop_event.wait(self.poll_interval)
                 
             except KeyboardInterrupt:
                 logger.info("Monitoring stopped by user")
                 break
             except Exception as e:
                 logger.error(f"Error in monitoring loop: {e}")
-                time.sleep(self.poll_interval)
+                stop_event.wait(self.poll_interval)
+        
+        logger.info("Ring neighborhood monitoring stopped")
     
-    def get_all_matches(self) -> List[Dict]:
+    def get_all_matches(self) -> List[Match]:
         """Get all detected matches"""
         return self.matches
     
-    def get_matches_by_term(self, term: str) -> List[Dict]:
-        """Filter matches by keyword or emoji"""
-        term_lower = term.lower()
-        filtered = []
-        
-        for match in self.matches:
-            if term_lower in [kw.lower() for kw in match['matched_keywords']]:
-                filtered.append(match)
-            elif term in match['matched_emojis']:
-                filtered.append(match)
-                
-        return filtered
+    def _index_matches(self):
+        """Add matches appended since the last lookup to the term indexes (caller holds _index_lock)"""
+        for position in range(self._indexed, len(self.matches)):
+            match = self.matches[position]
+            for kw in set(match.matched_keywords):
+                self._keyword_index[kw.lower()].append(position)
+            for emoji in set(match.matched_emojis):
+                self._emoji_index[emoji].append(position)
+        self._indexed = len(self.matches)
+    
+    def get_matches_by_term(self, term: str) -> List[Match]:
+        """Filter matches by keyword (case-insensitive) or emoji"""
+        with self._index_lock:
+            self._index_matches()
+            positions = self._keyword_index.get(term.lower(), [])
+            emoji_positions = self._emoji_index.get(term, [])
+            if emoji_positions:
+                # A term configured as both keyword and emoji: merge, keeping match order
+                positions = sorted(set(positions).union(emoji_positions)) if positions else emoji_positions
+            return [self.matches[position] for position in positions]
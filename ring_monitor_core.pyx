@@ -0,0 +1,20 @@
+# cython: language_level=3
+"""
+Compiled scan loop for RingMonitor.check_for_matches_soa
+Build in place with `python setup.py build_ext --inplace`
+"""
+
+
+def scan_batch(list texts, tuple keywords, tuple emojis, object find):
+    """Return (matched_keywords, matched_emojis) for each lowercased post text, in configured order"""
+    cdef Py_ssize_t i, n = len(texts)
+    cdef list results = [None] * n
+    cdef object hits
+    
+    for i in range(n):
+        # Without a matcher, substring checks against the text itself stand in for the hit set
+        hits = texts[i] if find is None else find(texts[i])
+        results[i] = (tuple([kw for kw in keywords if kw in hits]),
+                      tuple([emoji for emoji in emojis if emoji in hits]))
+    
+    return results
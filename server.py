@@ -2,79 +2,302 @@
 Web Server for Ring Neighborhood Heat Map
 Serves real-time heat map of detected Ring neighborhood posts
 """
-import json
+from gevent import monkey
+
+if __name__ == '__main__':
+    # Patch the standard library before anything else imports it so the
+    # gevent WSGI server, SocketIO and the monitor loop share one scheduler
+    monkey.patch_all()
+
+import codecs
+import copy
+import functools
+import hashlib
+import itertools
 import logging
 import secrets
+import signal
+import time
+from collections import Counter
 import asyncio
+import atexit
 import os
-from flask import Flask, render_template, jsonify, request, session, redirect, url_for
+import queue
+from json import JSONDecodeError
+from logging.handlers import QueueHandler, QueueListener
+from flask import Flask, render_template, request, session, redirect, url_for, g, stream_with_context
 from flask_socketio import SocketIO, emit
 from flask_cors import CORS
-from threading import Thread, Lock
+from flask_compress import Compress
+from threading import Event, Thread, Lock
+from concurrent.futures import ThreadPoolExecutor
 from ring_monitor import RingMonitor
 from ring_browser_auth import RingBrowserAuth
 
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    # Fall back to the standard library when orjson is not available
+    import json
+    from json import loads as json_loads
+
+    def json_dumps(obj):
+        """Serialize obj to compact UTF-8 JSON bytes, the same shape orjson produces"""
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+# Serve '/api/matches/' directly rather than answering with a redirect first;
+# must be set before any route is registered
+app.url_map.strict_slashes = False
 app.config['SECRET_KEY'] = secrets.token_hex(32)
+# Templates never change while the server runs; skip Jinja's per-render mtime checks
+app.config['TEMPLATES_AUTO_RELOAD'] = False
+# Compress JSON API responses; small payloads are not worth the CPU
+app.config['COMPRESS_MIMETYPES'] = ['application/json', 'application/x-ndjson']
+app.config['COMPRESS_MIN_SIZE'] = 500
 CORS(app)
-socketio = SocketIO(app, cors_allowed_origins="*")
+Compress(app)
+
+
+class JsonCodec:
+    """json-module stand-in so python-socketio encodes packets with json_dumps"""
+    
+    @staticmethod
+    def dumps(obj, *args, **kwargs):
+        # json_dumps output is always compact, which covers the separators argument
+        return json_dumps(obj).decode('utf-8')
+    
+    loads = staticmethod(json_loads)
+
+
+# gevent greenlets only get scheduled once the standard library is patched, which
+# happens when server.py is run directly; anything else that imports it uses threads
+socketio = SocketIO(app, cors_allowed_origins="*", json=JsonCodec,
+                    async_mode='gevent' if monkey.is_module_patched('socket') else 'threading')
 
 # Global monitor instance
 monitor = None
 monitor_thread = None
+# Set to stop the loop in monitor_thread, e.g. when a re-login installs a new monitor
+monitor_stop = None
 auth_lock = Lock()
-pending_credentials = None
 browser_auth = None
 auth_state_file = 'ring_auth_state.json'
+log_listener = None
+
+# Ring authentication runs off the request thread; clients poll /login/status/<job_id>
+auth_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='ring-auth')
+auth_jobs = {}
+AUTH_JOB_TTL_SECONDS = 300
+CONFIG_PATH = 'config.json'
+
+# Matches are broadcast in batches so a burst from one poll becomes one event
+MATCH_BROADCAST_INTERVAL = 0.1
+broadcast_lock = Lock()
+pending_broadcast = []
+broadcast_scheduled = False
+page_cache = {}
+# (monitor, body, etag) for /api/config; rebuilt when a different monitor is installed
+config_payload = None
+
+# Running match statistics, updated as matches arrive instead of on each request
+stats_lock = Lock()
+keyword_counts = Counter()
+emoji_counts = Counter()
+total_matches = 0
+
+
+def configure_queue_logging():
+    """Move log handler I/O onto a listener thread.
+
+    The root handlers installed by basicConfig are handed to a QueueListener and
+    replaced with a single QueueHandler, so request handlers and the match
+    broadcast path only enqueue records instead of writing to the stream.
+    """
+    global log_listener
+    root = logging.getLogger()
+    if log_listener is not None or not root.handlers:
+        return
+    
+    log_queue = queue.SimpleQueue()
+    log_listener = QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+    root.handlers = [QueueHandler(log_queue)]
+    log_listener.start()
+    atexit.register(log_listener.stop)
+
+
+def json_response(data):
+    """Serialize data into a compact application/json response"""
+    return app.response_class(json_dumps(data), mimetype='application/json')
 
 
-def load_config():
-    """Load configuration from JSON file"""
+def iter_matches(matches):
+    """Iterate the matches present now as JSON-ready dicts, ignoring ones appended while streaming"""
+    return (match.as_dict() for match in itertools.islice(matches, len(matches)))
+
+
+def iter_json_array(items):
+    """Yield a JSON array one serialized element at a time"""
+    yield b'['
+    separator = b''
+    for item in items:
+        yield separator + json_dumps(item)
+        separator = b','
+    yield b']'
+
+
+def render_page(template_name):
+    """Render a template that takes no context once and serve the cached bytes"""
+    body = page_cache.get(template_name)
+    if body is None:
+        body = render_template(template_name).encode('utf-8')
+        page_cache[template_name] = body
+    return app.response_class(body, mimetype='text/html')
+
+
+def warm_templates():
+    """Compile and render the static pages so the first visitor doesn't pay for it"""
+    with app.app_context():
+        for template_name in ('login.html', 'index.html'):
+            render_page(template_name)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(path, mtime_ns, size):
+    """Parse a config file; the stat fields in the key make any edit a cache miss"""
+    with open(path, 'rb') as f:
+        # Strip the UTF-8 BOM if present; orjson rejects it
+        return json_loads(f.read().removeprefix(codecs.BOM_UTF8))
+
+
+def load_config(config_path=None):
+    """Load configuration from JSON file (CONFIG_PATH unless config_path is given)"""
+    if config_path is None:
+        config_path = CONFIG_PATH
     try:
-        # Use utf-8-sig encoding to handle UTF-8 BOM if present
-        with open('config.json', 'r', encoding='utf-8-sig') as f:
-            return json.load(f)
+        st = os.stat(config_path)
+        config = _load_config_cached(os.path.abspath(config_path), st.st_mtime_ns, st.st_size)
     except FileNotFoundError:
-        logger.error("config.json not found")
+        logger.error("%s not found", config_path)
         return None
-    except json.JSONDecodeError as e:
+    except JSONDecodeError as e:
         # Defensive attribute access in case exception object is malformed
         try:
             msg = getattr(e, 'msg', 'Unknown JSON error')
             lineno = getattr(e, 'lineno', '?')
             colno = getattr(e, 'colno', '?')
-            logger.error(f"Invalid JSON in config.json: {msg} at line {lineno}, column {colno}")
+            logger.error("Invalid JSON in %s: %s at line %s, column %s", config_path, msg, lineno, colno)
         except Exception:
             # Fallback if accessing attributes fails
-            logger.error(f"Invalid JSON in config.json: {str(e)}")
-        logger.error("Please check your config.json file for syntax errors (trailing commas, missing brackets, etc.)")
+            logger.error("Invalid JSON in %s: %s", config_path, e)
+        logger.error("Please check your config file for syntax errors (trailing commas, missing brackets, etc.)")
         logger.error("You can validate your JSON at https://jsonlint.com/")
         return None
     except Exception as e:
         # Catch any other unexpected errors
-        logger.error(f"Unexpected error loading config.json: {type(e).__name__}: {e}")
+        logger.error("Unexpected error loading %s: %s: %s", config_path, type(e).__name__, e)
         return None
+    # Callers fill in credentials, so never hand out the cached dict itself
+    return copy.deepcopy(config)
+
+
+def reload_config(signum=None, frame=None):
+    """Drop cached configuration so the next load re-reads the config file"""
+    _load_config_cached.cache_clear()
+
+
+def reset_stats(matches):
+    """Rebuild the running statistics from an existing list of matches"""
+    global total_matches
+    with stats_lock:
+        keyword_counts.clear()
+        emoji_counts.clear()
+        for match in matches:
+            keyword_counts.update(match.matched_keywords)
+            emoji_counts.update(match.matched_emojis)
+        total_matches = len(matches)
 
 
 def on_new_match(match):
-    """Callback for new matches - emit via SocketIO"""
-    logger.info(f"Broadcasting new match: {match['id']}")
-    socketio.emit('new_match', match, namespace='/')
+    """Callback for new matches - update statistics and queue a SocketIO broadcast"""
+    global total_matches, broadcast_scheduled
+    with stats_lock:
+        keyword_counts.update(match.matched_keywords)
+        emoji_counts.update(match.matched_emojis)
+        total_matches += 1
+    
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Broadcasting new match: %s", match.id)
+    
+    with broadcast_lock:
+        pending_broadcast.append(match)
+        if broadcast_scheduled:
+            return
+        broadcast_scheduled = True
+    socketio.start_background_task(flush_broadcast)
 
 
-def start_monitoring_thread():
-    """Start the Ring monitoring in a background thread"""
-    global monitor
-    if monitor:
-        monitor.start_monitoring(callback=on_new_match)
+def flush_broadcast():
+    """Emit the matches buffered during the last interval as one new_matches event"""
+    global broadcast_scheduled
+    socketio.sleep(MATCH_BROADCAST_INTERVAL)
+    with broadcast_lock:
+        batch = pending_broadcast[:]
+        pending_broadcast.clear()
+        broadcast_scheduled = False
+    socketio.emit('new_matches', [match.as_dict() for match in batch], namespace='/')
+
+
+def start_monitoring_thread(current, stop_event):
+    """Run the Ring monitoring loop for one monitor until stop_event is set"""
+    current.start_monitoring(callback=on_new_match, stop_event=stop_event)
+
+
+def restart_monitoring():
+    """Stop the loop polling any previous monitor and start one for the current monitor"""
+    global monitor_thread, monitor_stop
+    if monitor_stop is not None:
+        monitor_stop.set()
+    monitor_stop = Event()
+    monitor_thread = socketio.start_background_task(start_monitoring_thread, monitor, monitor_stop)
 
 
 def is_authenticated():
-    """Check if user is authenticated"""
-    return session.get('authenticated', False)
+    """Check if user is authenticated, reading the signed session once per request"""
+    if 'authenticated' not in g:
+        g.authenticated = session.get('authenticated', False)
+    return g.authenticated
+
+
+def login_required(view):
+    """Redirect to the login page unless the session is authenticated"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not is_authenticated():
+            return redirect(url_for('login'))
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def api_login_required(view):
+    """Answer 401 with a JSON error unless the session is authenticated
+    
+    API clients (the dashboard's fetch calls) need an error they can act on,
+    not a redirect to the HTML login page.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not is_authenticated():
+            return json_response({
+                'success': False,
+                'error_type': 'unauthenticated',
+                'message': 'Login required. Please log in again.'
+            }), 401
+        return view(*args, **kwargs)
+    return wrapper
 
 
 @app.route('/login', methods=['GET', 'POST'])
@@ -89,7 +312,9 @@ def login():
     
     POST /login:
         - Accepts JSON payload with username, password, and optional otp_code
-        - Uses ring-doorbell library to authenticate with Ring's API
+        - Starts ring-doorbell authentication with Ring's API in the background
+          and returns 202 with a job_id
+        - The client polls GET /login/status/<job_id> until pending is False
         - Handles the 2FA flow if the Ring account has SMS verification enabled
         
     Ring Authentication Flow via ring-doorbell:
@@ -113,7 +338,8 @@ def login():
     
     Error Handling:
     ---------------
-    The implementation provides specific feedback for different failure types:
+    The implementation provides specific feedback for different failure types
+    (everything but validation is reported by the status endpoint):
     - Missing credentials: 400 error with validation message
     - 2FA required: 200 response with requires_otp flag and instructions
     - Invalid credentials/OTP: 401 error with credential check message
@@ -125,7 +351,7 @@ def login():
         # If already authenticated, redirect to dashboard to prevent re-login
         if is_authenticated():
             return redirect(url_for('index'))
-        return render_template('login.html')
+        return render_page('login.html')
     
     # Handle POST request (authentication attempt with ring-doorbell library)
     try:
@@ -137,26 +363,16 @@ def login():
         
         # Validate required fields
         if not username or not password:
-            return jsonify({
+            return json_response({
                 'success': False,
                 'error_type': 'validation',
                 'message': 'Ring email address and password are required'
             }), 400
         
-        global monitor, monitor_thread, pending_credentials
-        
-        # Store credentials temporarily for potential retry with OTP
-        with auth_lock:
-            pending_credentials = {
-                'username': username,
-                'password': password,
-                'otp_code': otp_code
-            }
-        
         # Load monitoring configuration (keywords, poll interval, etc.)
         config = load_config()
         if not config:
-            return jsonify({
+            return json_response({
                 'success': False,
                 'error_type': 'server',
                 'message': 'Server configuration error. Please contact administrator.'
@@ -173,101 +389,156 @@ def login():
         # This creates an instance but doesn't authenticate yet
         temp_monitor = RingMonitor(config)
         
-        # Attempt authentication via ring-doorbell library
-        # This calls Ring's OAuth API to exchange credentials for tokens
-        auth_result = temp_monitor.authenticate()
+        # Authenticate via ring-doorbell in the background; this is a network
+        # round-trip to Ring's OAuth API and must not hold the request thread
+        prune_auth_jobs()
+        job_id = secrets.token_urlsafe(16)
+        future = auth_executor.submit(temp_monitor.authenticate)
+        auth_jobs[job_id] = (future, temp_monitor, username, otp_code, time.monotonic())
         
-        # Handle authentication result
-        if auth_result == 'requires_otp' and not otp_code:
-            # CASE 1: 2FA is enabled but user hasn't provided OTP code yet
-            # Ring has sent an SMS with 6-digit code to the user's phone
-            # Return special response to trigger OTP input in UI
-            logger.info(f"2FA required for user {username}, waiting for OTP code")
-            return jsonify({
-                'success': False,
-                'requires_otp': True,
-                'error_type': '2fa_required',
-                'message': 'Two-factor authentication is enabled on your Ring account. Please enter the 6-digit verification code sent to your phone via SMS.'
-            }), 200
-            
-        elif auth_result == True:
-            # CASE 2: Authentication successful!
-            # ring-doorbell has obtained OAuth tokens from Ring's API
-            # User is now authenticated and can access Ring data
-            
-            # Create authenticated session
-            session['authenticated'] = True
-            session['username'] = username
-            session.permanent = True  # Keep session across browser restarts
-            
-            # Store refresh token in session for persistent authentication
-            # This allows re-authentication without credentials on next login
-            if temp_monitor.config['ring'].get('refresh_token'):
-                session['refresh_token'] = temp_monitor.config['ring']['refresh_token']
-            
-            # Update global monitor instance with authenticated session
-            with auth_lock:
-                monitor = temp_monitor
-                pending_credentials = None  # Clear stored credentials
-            
-            # Start background monitoring thread if not already running
-            # This begins polling Ring API for neighborhood posts
-            if not monitor_thread or not monitor_thread.is_alive():
-                monitor_thread = Thread(target=start_monitoring_thread, daemon=True)
-                monitor_thread.start()
-            
-            logger.info(f"User {username} authenticated successfully with Ring")
-            return jsonify({
-                'success': True,
-                'message': 'Successfully authenticated with Ring. Redirecting to dashboard...'
-            }), 200
-            
-        else:
-            # CASE 3: Authentication failed
-            # Could be: wrong password, invalid OTP, expired OTP, Ring API error, etc.
-            # Provide detailed feedback to help user troubleshoot
-            
-            error_message = 'Authentication with Ring failed. '
-            
-            if otp_code:
-                # User provided OTP but auth still failed
-                # Most likely: wrong OTP, expired OTP, or credential issue
-                error_message += 'Please check your email, password, and verification code. The SMS code may have expired - request a new one by logging in again.'
-                error_type = 'invalid_otp'
-                logger.warning(f"Authentication failed for {username} with OTP code")
-            else:
-                # No OTP provided, likely credential error
-                error_message += 'Please verify your Ring email address and password are correct.'
-                error_type = 'invalid_credentials'
-                logger.warning(f"Authentication failed for {username}: invalid credentials")
-            
-            return jsonify({
-                'success': False,
-                'error_type': error_type,
-                'message': error_message
-            }), 401
+        return json_response({
+            'success': False,
+            'pending': True,
+            'job_id': job_id
+        }), 202
             
     except Exception as e:
-        # Catch unexpected errors (network issues, Ring API changes, etc.)
-        error_str = str(e)
-        logger.error(f"Login error for {username if 'username' in locals() else 'unknown'}: {error_str}")
+        return login_error_response(username if 'username' in locals() else 'unknown', e)
+
+
+@app.route('/login/status/<job_id>')
+def login_status(job_id):
+    """Report the outcome of a background authentication started by POST /login.
+    
+    Returns 202 with pending=True while ring-doorbell is still talking to Ring,
+    then the same responses POST /login used to return synchronously.
+    """
+    job = auth_jobs.get(job_id)
+    if job is None:
+        return json_response({
+            'success': False,
+            'error_type': 'validation',
+            'message': 'Unknown or expired login attempt. Please log in again.'
+        }), 404
+    
+    future, temp_monitor, username, otp_code, _ = job
+    if not future.done():
+        return json_response({
+            'success': False,
+            'pending': True,
+            'job_id': job_id
+        }), 202
+    
+    auth_jobs.pop(job_id, None)
+    try:
+        return finish_login(future.result(), temp_monitor, username, otp_code)
+    except Exception as e:
+        return login_error_response(username, e)
+
+
+def prune_auth_jobs():
+    """Drop authentication jobs that nobody polled within AUTH_JOB_TTL_SECONDS"""
+    cutoff = time.monotonic() - AUTH_JOB_TTL_SECONDS
+    for job_id, job in list(auth_jobs.items()):
+        if job[4] < cutoff:
+            auth_jobs.pop(job_id, None)
+
+
+def finish_login(auth_result, temp_monitor, username, otp_code):
+    """Turn a completed ring-doorbell authentication into a login response"""
+    global monitor
+    
+    # Handle authentication result
+    if auth_result == 'requires_otp' and not otp_code:
+        # CASE 1: 2FA is enabled but user hasn't provided OTP code yet
+        # Ring has sent an SMS with 6-digit code to the user's phone
+        # Return special response to trigger OTP input in UI
+        logger.info("2FA required for user %s, waiting for OTP code", username)
+        return json_response({
+            'success': False,
+            'requires_otp': True,
+            'error_type': '2fa_required',
+            'message': 'Two-factor authentication is enabled on your Ring account. Please enter the 6-digit verification code sent to your phone via SMS.'
+        }), 200
+        
+    elif auth_result == True:
+        # CASE 2: Authentication successful!
+        # ring-doorbell has obtained OAuth tokens from Ring's API
+        # User is now authenticated and can access Ring data
+        
+        # Create authenticated session
+        session['authenticated'] = True
+        session['username'] = username
+        session.permanent = True  # Keep session across browser restarts
+        
+        # Store refresh token in session for persistent authentication
+        # This allows re-authentication without credentials on next login
+        if temp_monitor.config['ring'].get('refresh_token'):
+            session['refresh_token'] = temp_monitor.config['ring']['refresh_token']
+        
+        # Update global monitor instance with authenticated session
+        with auth_lock:
+            monitor = temp_monitor
+        reset_stats(monitor.get_all_matches())
         
-        # Try to provide helpful error message based on exception
-        error_type = 'server'
-        if 'network' in error_str.lower() or 'connection' in error_str.lower():
-            error_message = 'Network error connecting to Ring. Please check your internet connection and try again.'
-            error_type = 'network'
-        elif 'timeout' in error_str.lower():
-            error_message = 'Connection to Ring timed out. Please try again.'
-            error_type = 'timeout'
+        # Start background monitoring for the new monitor, stopping any earlier loop
+        # This begins polling Ring API for neighborhood posts
+        restart_monitoring()
+        
+        logger.info("User %s authenticated successfully with Ring", username)
+        return json_response({
+            'success': True,
+            'message': 'Successfully authenticated with Ring. Redirecting to dashboard...'
+        }), 200
+        
+    else:
+        # CASE 3: Authentication failed
+        # Could be: wrong password, invalid OTP, expired OTP, Ring API error, etc.
+        # Provide detailed feedback to help user troubleshoot
+        
+        error_message = 'Authentication with Ring failed. '
+        
+        if otp_code:
+            # User provided OTP but auth still failed
+            # Most likely: wrong OTP, expired OTP, or credential issue
+            error_message += 'Please check your email, password, and verification code. The SMS code may have expired - request a new one by logging in again.'
+            error_type = 'invalid_otp'
+            logger.warning("Authentication failed for %s with OTP code", username)
         else:
-            error_message = f'An error occurred during authentication: {error_str}'
+            # No OTP provided, likely credential error
+            error_message += 'Please verify your Ring email address and password are correct.'
+            error_type = 'invalid_credentials'
+            logger.warning("Authentication failed for %s: invalid credentials", username)
         
-        return jsonify({
+        return json_response({
             'success': False,
             'error_type': error_type,
             'message': error_message
-        }), 500
+        }), 401
+
+
+def login_error_response(username, e):
+    """Map an unexpected login exception to a 500 response with helpful feedback"""
+    # Catch unexpected errors (network issues, Ring API changes, etc.)
+    error_str = str(e)
+    logger.error("Login error for %s: %s", username, error_str)
+    
+    # Try to provide helpful error message based on exception
+    error_type = 'server'
+    if 'network' in error_str.lower() or 'connection' in error_str.lower():
+        error_message = 'Network error connecting to Ring. Please check your internet connection and try again.'
+        error_type = 'network'
+    elif 'timeout' in error_str.lower():
+        error_message = 'Connection to Ring timed out. Please try again.'
+        error_type = 'timeout'
+    else:
+        error_message = f'An error occurred during authentication: {error_str}'
+    
+    return json_response({
+        'success': False,
+        'error_type': error_type,
+        'message': error_message
+    }), 500
 
 
 @app.route('/logout')
@@ -281,7 +552,7 @@ def logout():
     # Note: We don't stop the monitor thread as it's daemon and will stop with the app
     # This allows other users to still see data if in a multi-user scenario
     
-    logger.info(f"User {username} logged out")
+    logger.info("User %s logged out", username)
     return redirect(url_for('login'))
 
 
@@ -293,14 +564,14 @@ def start_browser_auth():
     try:
         # Check if already authenticated
         if is_authenticated():
-            return jsonify({
+            return json_response({
                 'success': False,
                 'message': 'Already authenticated'
             }), 400
         
         # Check if browser auth is already in progress
         if browser_auth is not None:
-            return jsonify({
+            return json_response({
                 'success': False,
                 'message': 'Browser authentication already in progress'
             }), 400
@@ -337,7 +608,7 @@ def start_browser_auth():
                         # The client-side polling will detect successful auth via monitor state
                     
                 except Exception as e:
-                    logger.error(f"Browser authentication failed: {e}")
+                    logger.error("Browser authentication failed: %s", e)
                 finally:
                     await browser_auth.close()
                     browser_auth = None
@@ -349,15 +620,15 @@ def start_browser_auth():
         auth_thread = Thread(target=run_auth, daemon=True)
         auth_thread.start()
         
-        return jsonify({
+        return json_response({
             'success': True,
             'message': 'Browser authentication started. Please complete login in the browser window.'
         }), 200
         
     except Exception as e:
-        logger.error(f"Error starting browser auth: {e}")
+        logger.error("Error starting browser auth: %s", e)
         browser_auth = None  # Reset on error
-        return jsonify({
+        return json_response({
             'success': False,
             'message': str(e)
         }), 500
@@ -371,19 +642,19 @@ def check_browser_auth_status():
         # Mark session as authenticated
         session['authenticated'] = True
         session['auth_method'] = 'browser'
-        return jsonify({
+        return json_response({
             'authenticated': True,
             'method': 'browser'
         }), 200
     
     # Fall back to session check
     if is_authenticated():
-        return jsonify({
+        return json_response({
             'authenticated': True,
             'method': session.get('auth_method', 'unknown')
         }), 200
     
-    return jsonify({
+    return json_response({
         'authenticated': False,
         'browser_active': browser_auth is not None
     }), 200
@@ -399,7 +670,7 @@ async def initialize_monitor_from_browser_auth(auth_data):
     This function will typically fail with "Could not extract authentication tokens"
     because the required refresh_token is not available.
     """
-    global monitor, monitor_thread
+    global monitor
     
     logger.warning("=" * 70)
     logger.warning("⚠️ EXPERIMENTAL: Attempting to initialize monitor from browser auth")
@@ -415,11 +686,11 @@ async def initialize_monitor_from_browser_auth(auth_data):
     
     logger.info("Checking for refresh token in intercepted API calls...")
     if auth_data.get('intercepted_tokens'):
-        logger.info(f"Found {len(auth_data['intercepted_tokens'])} intercepted token responses")
+        logger.info("Found %d intercepted token responses", len(auth_data['intercepted_tokens']))
         for i, token_data in enumerate(auth_data['intercepted_tokens']):
             if isinstance(token_data, dict) and 'refresh_token' in token_data:
                 refresh_token = token_data['refresh_token']
-                logger.info(f"✓ Found refresh token in intercepted API call #{i}")
+                logger.info("✓ Found refresh token in intercepted API call #%d", i)
                 break
         if not refresh_token:
             logger.warning("❌ No refresh_token found in any intercepted API calls")
@@ -429,12 +700,12 @@ async def initialize_monitor_from_browser_auth(auth_data):
     if not refresh_token:
         logger.info("Checking for refresh token in browser storage...")
         if auth_data.get('tokens'):
-            logger.info(f"Found {len(auth_data['tokens'])} token-related storage keys")
+            logger.info("Found %d token-related storage keys", len(auth_data['tokens']))
             for key, value in auth_data['tokens'].items():
-                logger.info(f"  - Checking key: {key}")
+                logger.info("  - Checking key: %s", key)
                 if isinstance(value, dict) and 'refresh_token' in value:
                     refresh_token = value['refresh_token']
-                    logger.info(f"✓ Found refresh token in browser storage key: {key}")
+                    logger.info("✓ Found refresh token in browser storage key: %s", key)
                     break
             if not refresh_token:
                 logger.warning("❌ No refresh_token found in any browser storage keys")
@@ -456,16 +727,15 @@ async def initialize_monitor_from_browser_auth(auth_data):
         # Initialize monitor with refresh token
         with auth_lock:
             monitor = RingMonitor(config)
+            reset_stats(monitor.get_all_matches())
             auth_result = monitor.authenticate()
             
             if auth_result:
                 logger.info("✓✓✓ SUCCESS! Monitor initialized with browser-captured tokens!")
                 logger.info("✓✓✓ Browser authentication is now working!")
                 
-                # Start monitoring if not already running
-                if not monitor_thread or not monitor_thread.is_alive():
-                    monitor_thread = Thread(target=start_monitoring_thread, daemon=True)
-                    monitor_thread.start()
+                # Start monitoring the new monitor, stopping any earlier loop
+                restart_monitoring()
             else:
                 logger.error("❌ Failed to authenticate monitor with captured tokens")
                 raise RuntimeError("Failed to authenticate monitor with captured tokens")
@@ -487,72 +757,97 @@ async def initialize_monitor_from_browser_auth(auth_data):
 
 
 @app.route('/')
+@login_required
 def index():
     """Serve the heat map dashboard"""
-    if not is_authenticated():
-        return redirect(url_for('login'))
-    return render_template('index.html')
+    return render_page('index.html')
 
 
 @app.route('/api/matches')
+@api_login_required
 def get_matches():
-    """Get all matches"""
+    """Get all matches, streamed as a JSON array"""
+    if not monitor:
+        return json_response([])
+    matches = iter_matches(monitor.get_all_matches())
+    return app.response_class(stream_with_context(iter_json_array(matches)),
+                              mimetype='application/json')
+
+
+@app.route('/api/matches/stream')
+@api_login_required
+def stream_matches():
+    """Get all matches as newline-delimited JSON, one match per line"""
     if not monitor:
-        return jsonify([])
-    return jsonify(monitor.get_all_matches())
+        return app.response_class(b'', mimetype='application/x-ndjson')
+    matches = iter_matches(monitor.get_all_matches())
+    return app.response_class((json_dumps(match) + b'\n' for match in matches),
+                              mimetype='application/x-ndjson')
 
 
 @app.route('/api/matches/filter')
+@api_login_required
 def filter_matches():
     """Filter matches by term"""
     term = request.args.get('term', '')
     if not monitor or not term:
-        return jsonify([])
-    return jsonify(monitor.get_matches_by_term(term))
+        return json_response([])
+    return json_response([match.as_dict() for match in monitor.get_matches_by_term(term)])
 
 
 @app.route('/api/stats')
+@api_login_required
 def get_stats():
     """Get statistics about matches"""
     if not monitor:
-        return jsonify({
+        return json_response({
             'total_matches': 0,
             'keywords': [],
             'emojis': []
         })
     
-    matches = monitor.get_all_matches()
+    # Snapshot the running counters maintained by on_new_match
+    with stats_lock:
+        total = total_matches
+        keywords = dict(keyword_counts)
+        emojis = dict(emoji_counts)
     
-    # Count keyword occurrences
-    keyword_counts = {}
-    emoji_counts = {}
-    
-    for match in matches:
-        for kw in match.get('matched_keywords', []):
-            keyword_counts[kw] = keyword_counts.get(kw, 0) + 1
-        for emoji in match.get('matched_emojis', []):
-            emoji_counts[emoji] = emoji_counts.get(emoji, 0) + 1
-    
-    return jsonify({
-        'total_matches': len(matches),
-        'keyword_counts': keyword_counts,
-        'emoji_counts': emoji_counts,
+    return json_response({
+        'total_matches': total,
+        'keyword_counts': keywords,
+        'emoji_counts': emojis,
         'configured_keywords': monitor.keywords,
         'configured_emojis': monitor.emojis
     })
 
 
 @app.route('/api/config')
+@api_login_required
 def get_config():
     """Get monitoring configuration (without credentials)"""
-    if not monitor:
-        return jsonify({})
+    global config_payload
+    current = monitor
+    if not current:
+        return json_response({})
     
-    return jsonify({
-        'keywords': monitor.keywords,
-        'emojis': monitor.emojis,
-        'poll_interval': monitor.poll_interval
-    })
+    # The configuration only changes when a new monitor is installed, so
+    # serialize it once per monitor and let browsers revalidate with an ETag
+    if config_payload is None or config_payload[0] is not current:
+        body = json_dumps({
+            'keywords': current.keywords,
+            'emojis': current.emojis,
+            'poll_interval': current.poll_interval
+        })
+        config_payload = (current, body, hashlib.blake2b(body, digest_size=8).hexdigest())
+    _, body, etag = config_payload
+    
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, max-age=300'
+    return response
 
 
 @socketio.on('connect')
@@ -572,12 +867,18 @@ def main():
     """Main entry point"""
     global monitor, monitor_thread
     
+    configure_queue_logging()
+    
     # Load configuration (monitoring settings only, not credentials)
     config = load_config()
     if not config:
         logger.error("Failed to load configuration")
         return
     
+    # Edits to config.json are picked up by mtime; SIGHUP forces a re-read regardless
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP, reload_config)
+    
     # Clear any credentials from config file (we'll use web-based login)
     config['ring']['username'] = ''
     config['ring']['password'] = ''
@@ -586,16 +887,19 @@ def main():
     
     # Initialize monitor without credentials (will be set via web login)
     monitor = RingMonitor(config)
+    reset_stats(monitor.get_all_matches())
     
     # Note: monitoring thread will start after successful login
     
+    warm_templates()
+    
     # Start web server
     host = config['server']['host']
     port = config['server']['port']
     
-    logger.info(f"Starting Little Finger Monitor on http://{host}:{port}")
+    logger.info("Starting Little Finger Monitor on http://%s:%s", host, port)
     logger.info("Please open your browser and login to start monitoring")
-    socketio.run(app, host=host, port=port, debug=False, allow_unsafe_werkzeug=True)
+    socketio.run(app, host=host, port=port)
 
 
 if __name__ == '__main__':
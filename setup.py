@@ -0,0 +1,17 @@
+"""
+Builds the optional Cython scan loop used by ring_monitor
+
+    pip install cython
+    python setup.py build_ext --inplace
+"""
+from setuptools import setup, Extension
+from Cython.Build import cythonize
+
+setup(
+    name='little-finger-core',
+    ext_modules=cythonize(
+        [Extension("ring_monitor_core", ["ring_monitor_core.pyx"])],
+        language_level=3,
+        compiler_directives={"boundscheck": False},
+    ),
+)
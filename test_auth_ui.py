@@ -3,7 +3,39 @@ Test suite for web-based authentication UI
 Tests the login flow and session management
 """
 import json
+import time
+import inspect
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import server
 from server import app
+from ring_monitor import RingMonitor
+
+# Request bodies are serialized once rather than on every post
+_EMPTY_LOGIN = b'{}'
+_WRONG_LOGIN = json.dumps({'username': 'test@example.com', 'password': 'wrong'}).encode()
+
+
+def create_test_config(keywords=('theft', 'police'), emojis=(), poll_interval_seconds=60):
+    """Monitoring config with blank Ring credentials for the tests' own monitors"""
+    return {
+        'ring': {'username': '', 'password': '', 'refresh_token': '', 'otp_code': ''},
+        'monitoring': {
+            'poll_interval_seconds': poll_interval_seconds,
+            'keywords': list(keywords),
+            'emojis': list(emojis)
+        }
+    }
+
+
+def _wait_for(condition, timeout=5.0):
+    """Poll condition until it holds or timeout seconds pass"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out waiting on a background task"
+        time.sleep(0.01)
 
 
 def test_login_page_redirect():
@@ -46,7 +78,7 @@ def test_login_validation():
     with app.test_client() as client:
         # Test with missing credentials
         response = client.post('/login',
-                              data=json.dumps({}),
+                              data=_EMPTY_LOGIN,
                               content_type='application/json')
         
         assert response.status_code == 400, f"Expected 400 for missing fields, got {response.status_code}"
@@ -58,6 +90,37 @@ def test_login_validation():
         print("✓ Login endpoint validates required fields")
 
 
+def test_login_runs_in_background():
+    """Test that login returns a job id and reports the result via the status endpoint"""
+    print("\n=== Testing Background Login ===")
+    
+    with app.test_client() as client, \
+            patch('server.RingMonitor.authenticate', return_value=False):
+        response = client.post('/login',
+                              data=_WRONG_LOGIN,
+                              content_type='application/json')
+        
+        assert response.status_code == 202, f"Expected 202 while pending, got {response.status_code}"
+        data = json.loads(response.data)
+        assert data['pending'] is True, "Expected pending=True"
+        
+        # Poll until the background authentication finishes
+        for _ in range(50):
+            response = client.get(f"/login/status/{data['job_id']}")
+            if response.status_code != 202:
+                break
+            time.sleep(0.05)
+        
+        assert response.status_code == 401, f"Expected 401 for failed auth, got {response.status_code}"
+        assert json.loads(response.data)['error_type'] == 'invalid_credentials'
+        
+        # Finished jobs are consumed by the first poll that reports them
+        response = client.get(f"/login/status/{data['job_id']}")
+        assert response.status_code == 404, f"Expected 404 for consumed job, got {response.status_code}"
+        
+        print("✓ Login authenticates in the background and reports via status endpoint")
+
+
 def test_session_management():
     """Test that sessions are managed correctly"""
     print("\n=== Testing Session Management ===")
@@ -80,18 +143,171 @@ def test_api_endpoints_work():
     print("\n=== Testing API Endpoints ===")
     
     with app.test_client() as client:
-        # API endpoints should work (they return empty data if no monitor)
+        with client.session_transaction() as sess:
+            sess['authenticated'] = True
+        
+        # API endpoints should work once logged in (they return empty data if no monitor)
         endpoints = ['/api/matches', '/api/stats', '/api/config']
         
         for endpoint in endpoints:
             response = client.get(endpoint)
-            # These might redirect or return data depending on auth state
-            # Just verify they don't error
-            assert response.status_code in [200, 302], f"{endpoint} returned {response.status_code}"
+            assert response.status_code == 200, f"{endpoint} returned {response.status_code}"
         
         print("✓ API endpoints are accessible")
 
 
+def test_api_requires_login():
+    """Test that API endpoints do not serve data to unauthenticated clients"""
+    print("\n=== Testing API Authentication ===")
+    
+    with app.test_client() as client:
+        for endpoint in ['/api/matches', '/api/matches/stream', '/api/matches/filter?term=test',
+                         '/api/stats', '/api/config']:
+            response = client.get(endpoint)
+            assert response.status_code == 401, f"{endpoint} returned {response.status_code} without login"
+            assert response.is_json, f"{endpoint} should answer with a JSON error, not a redirect"
+            assert response.get_json()['error_type'] == 'unauthenticated'
+    
+    print("✓ API endpoints require login")
+
+
+def test_matches_streaming(monkeypatch):
+    """Test that matches stream as a JSON array and as NDJSON"""
+    print("\n=== Testing Match Streaming ===")
+    
+    test_monitor = RingMonitor(create_test_config())
+    test_monitor.matches.extend(test_monitor.check_for_matches([
+        {'id': 'post_1', 'title': 'Theft', 'text': 'Package theft on Main St'},
+        {'id': 'post_2', 'title': 'Police', 'text': 'Police in the area'}
+    ]))
+    monkeypatch.setattr(server, 'monitor', test_monitor)
+    
+    with app.test_client() as client:
+        with client.session_transaction() as sess:
+            sess['authenticated'] = True
+        
+        response = client.get('/api/matches')
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        body = json.loads(response.data)
+        assert [m['id'] for m in body] == ['post_1', 'post_2']
+        assert body[0]['location'] == {'latitude': 0.0, 'longitude': 0.0, 'address': 'Unknown'}
+        assert body[0]['matched_keywords'] == ['theft']
+        
+        response = client.get('/api/matches/stream')
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        assert response.mimetype == 'application/x-ndjson'
+        lines = response.data.decode('utf-8').splitlines()
+        assert [json.loads(line)['id'] for line in lines] == ['post_1', 'post_2']
+    
+    print("✓ Matches stream as JSON array and NDJSON")
+
+
+def test_config_etag(monkeypatch):
+    """Test that /api/config is cached by the browser and revalidated with an ETag"""
+    print("\n=== Testing Config ETag ===")
+    
+    monkeypatch.setattr(server, 'monitor', RingMonitor(create_test_config()))
+    
+    with app.test_client() as client:
+        with client.session_transaction() as sess:
+            sess['authenticated'] = True
+        
+        response = client.get('/api/config')
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        assert response.headers.get('ETag'), "Expected an ETag header"
+        assert 'max-age' in response.headers.get('Cache-Control', ''), "Expected Cache-Control max-age"
+        
+        response = client.get('/api/config', headers={'If-None-Match': response.headers['ETag']})
+        assert response.status_code == 304, f"Expected 304 on matching ETag, got {response.status_code}"
+        assert response.data == b'', "Expected empty body on 304"
+    
+    print("✓ /api/config supports conditional requests")
+
+
+def test_monitoring_follows_new_monitor(monkeypatch):
+    """Test that after a re-login swaps monitors, the new monitor is polled, counted and broadcast"""
+    print("\n=== Testing Monitor Swap ===")
+    
+    config = create_test_config(emojis=['🚨'], poll_interval_seconds=0.01)
+    first, second = RingMonitor(config), RingMonitor(config)
+    for test_monitor, post in ((first, {'id': 'post_1', 'title': 'Theft', 'text': 'Package theft 🚨'}),
+                               (second, {'id': 'post_2', 'title': 'Police', 'text': 'Police in the area'})):
+        monkeypatch.setattr(test_monitor, 'authenticate', lambda: False)
+        monkeypatch.setattr(test_monitor, 'get_neighborhood_posts', lambda post=post: [post])
+    
+    # Let a broadcast queued by an earlier test go out first
+    _wait_for(lambda: not server.broadcast_scheduled)
+    emit = MagicMock()
+    monkeypatch.setattr(server.socketio, 'emit', emit)
+    monkeypatch.setattr(server, 'monitor_stop', None)
+    monkeypatch.setattr(server, 'monitor_thread', None)
+    
+    try:
+        # First login
+        monkeypatch.setattr(server, 'monitor', first)
+        server.reset_stats(first.get_all_matches())
+        server.restart_monitoring()
+        first_stop = server.monitor_stop
+        _wait_for(lambda: first.matches)
+        
+        # Re-login installs a new monitor, as finish_login does
+        monkeypatch.setattr(server, 'monitor', second)
+        server.reset_stats(second.get_all_matches())
+        server.restart_monitoring()
+        _wait_for(lambda: second.matches)
+        assert first_stop.is_set(), "The loop for the replaced monitor should be stopped"
+        _wait_for(lambda: not server.broadcast_scheduled)
+        
+        with app.test_client() as client:
+            with client.session_transaction() as sess:
+                sess['authenticated'] = True
+            stats = client.get('/api/stats').get_json()
+            matches = client.get('/api/matches').get_json()
+    finally:
+        server.monitor_stop.set()
+        server.reset_stats([])
+    
+    broadcast = [match['id'] for call in emit.call_args_list for match in call.args[1]]
+    assert broadcast == ['post_1', 'post_2'], f"Expected both monitors' matches broadcast, got {broadcast}"
+    assert stats['total_matches'] == 1, f"Expected 1 match, got {stats['total_matches']}"
+    assert stats['keyword_counts'] == {'police': 1}
+    assert [m['id'] for m in matches] == ['post_2']
+    
+    print("✓ Monitoring follows the installed monitor")
+
+
+def test_match_broadcast_batching():
+    """Test that matches reported together reach SocketIO clients as one new_matches event"""
+    print("\n=== Testing Match Broadcast Batching ===")
+    
+    matches = RingMonitor(create_test_config()).check_for_matches([
+        {'id': 'post_1', 'title': 'Theft', 'text': 'Package theft on Main St'},
+        {'id': 'post_2', 'title': 'Police', 'text': 'Police in the area'}
+    ])
+    
+    # Let a broadcast queued by an earlier test go out first
+    _wait_for(lambda: not server.broadcast_scheduled)
+    
+    try:
+        with patch.object(server.socketio, 'emit') as emit:
+            for match in matches:
+                server.on_new_match(match)
+            # Both matches land inside one broadcast interval
+            time.sleep(server.MATCH_BROADCAST_INTERVAL * 5)
+    finally:
+        server.reset_stats([])
+    
+    payload = [match.as_dict() for match in matches]
+    emit.assert_called_once_with('new_matches', payload, namespace='/')
+    
+    # SocketIO encodes packets through JsonCodec, which must hand back text
+    encoded = server.JsonCodec.dumps(payload)
+    assert isinstance(encoded, str), f"Expected str, got {type(encoded).__name__}"
+    assert server.JsonCodec.loads(encoded) == payload
+    
+    print("✓ Matches are broadcast in batches")
+
+
 def main():
     """Run all tests"""
     print("╔════════════════════════════════════════════════╗")
@@ -102,8 +318,14 @@ def main():
         test_login_page_redirect,
         test_login_page_loads,
         test_login_validation,
+        test_login_runs_in_background,
         test_session_management,
-        test_api_endpoints_work
+        test_api_endpoints_work,
+        test_api_requires_login,
+        test_matches_streaming,
+        test_config_etag,
+        test_monitoring_follows_new_monitor,
+        test_match_broadcast_batching
     ]
     
     passed = 0
@@ -111,7 +333,12 @@ def main():
     
     for test_func in tests:
         try:
-            test_func()
+            # Tests that swap server state take a monkeypatch, undone when each test ends
+            with pytest.MonkeyPatch.context() as monkeypatch:
+                if 'monkeypatch' in inspect.signature(test_func).parameters:
+                    test_func(monkeypatch)
+                else:
+                    test_func()
             passed += 1
         except AssertionError as e:
             print(f"✗ FAILED: {e}")
@@ -2,10 +2,14 @@
 Integration test to demonstrate the browser auth button fix
 This test simulates the exact scenario from the bug report
 """
-import sys
-import json
+import pytest
 
-def test_button_click_scenario():
+ring_browser_auth = pytest.importorskip("ring_browser_auth")
+
+import server
+
+
+def test_button_click_scenario(client, monkeypatch):
     """
     Simulate the exact scenario from the bug report:
     1. User clicks "Login through Ring" button
@@ -13,170 +17,45 @@ def test_button_click_scenario():
     3. JavaScript polls GET /auth/browser/status
     4. Status should show browser_active: true (fixing the bug)
     """
-    print("\n" + "=" * 60)
-    print("SIMULATING BUG SCENARIO")
-    print("=" * 60)
-    print("\nBefore Fix: Status returned {\"authenticated\":false,\"browser_active\":false}")
-    print("After Fix: Status should return {\"authenticated\":false,\"browser_active\":true}\n")
+    # Verify initial state
+    assert server.browser_auth is None, "browser_auth should start as None"
     
-    try:
-        from server import app, browser_auth as initial_browser_auth
-        from ring_browser_auth import RingBrowserAuth
-        import server
-        
-        # Verify initial state
-        assert initial_browser_auth is None, "browser_auth should start as None"
-        print("✓ Step 1: Initial state - browser_auth is None")
-        
-        with app.test_client() as client:
-            # Check initial status
-            response = client.get('/auth/browser/status')
-            data = response.get_json()
-            print(f"✓ Step 2: Initial status check - {json.dumps(data)}")
-            assert data == {'authenticated': False, 'browser_active': False}
-            
-            # Simulate what happens when button is clicked
-            # We manually set browser_auth like the fixed code does
-            print("\n→ Simulating button click (POST /auth/browser/start)...")
-            print("  [Fixed Code] Setting browser_auth = RingBrowserAuth(headless=False)")
-            
-            # This is what the fixed code now does BEFORE starting the thread
-            server.browser_auth = RingBrowserAuth(headless=False)
-            
-            # Now check status - it should show browser_active: true
-            response = client.get('/auth/browser/status')
-            data = response.get_json()
-            print(f"\n✓ Step 3: Status after button click - {json.dumps(data)}")
-            
-            # Verify the fix
-            assert data['authenticated'] == False, "Should not be authenticated yet"
-            assert data['browser_active'] == True, "Browser should be active!"
-            
-            print("\n" + "=" * 60)
-            print("🎉 BUG FIX VERIFIED!")
-            print("=" * 60)
-            print("\nThe status endpoint now correctly reports:")
-            print("  • browser_active: true (was false before)")
-            print("  • This allows the UI to show 'Waiting for login...'")
-            print("  • Browser window would open (not tested here)")
-            print("  • Polling continues until authentication completes")
-            
-            # Cleanup
-            server.browser_auth = None
-            
-        return True
-        
-    except AssertionError as e:
-        print(f"\n✗ ASSERTION FAILED: {e}")
-        return False
-    except Exception as e:
-        print(f"\n✗ ERROR: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-
-def test_status_api_behavior():
-    """Test the complete status API behavior"""
-    print("\n" + "=" * 60)
-    print("STATUS API BEHAVIOR TEST")
-    print("=" * 60)
+    # Check initial status
+    response = client.get('/auth/browser/status')
+    data = response.get_json()
+    assert data == {'authenticated': False, 'browser_active': False}
     
-    try:
-        from server import app
-        import server
-        from ring_browser_auth import RingBrowserAuth
-        from ring_monitor import RingMonitor
-        
-        with app.test_client() as client:
-            # Test 1: No authentication
-            print("\n[Test 1] No authentication:")
-            response = client.get('/auth/browser/status')
-            data = response.get_json()
-            print(f"  Response: {json.dumps(data)}")
-            assert data == {'authenticated': False, 'browser_active': False}
-            print("  ✓ Correct")
-            
-            # Test 2: Browser active (button clicked)
-            print("\n[Test 2] Browser auth in progress:")
-            server.browser_auth = RingBrowserAuth(headless=True)
-            response = client.get('/auth/browser/status')
-            data = response.get_json()
-            print(f"  Response: {json.dumps(data)}")
-            assert data == {'authenticated': False, 'browser_active': True}
-            print("  ✓ Correct - browser_active is now True!")
-            server.browser_auth = None
-            
-            # Test 3: Monitor authenticated
-            print("\n[Test 3] Authentication completed:")
-            config = {
-                'ring': {'username': '', 'password': '', 'refresh_token': '', 'otp_code': ''},
-                'monitoring': {'poll_interval_seconds': 60, 'keywords': [], 'emojis': []}
-            }
-            test_monitor = RingMonitor(config)
-            test_monitor.ring = object()  # Mock authenticated
-            original_monitor = server.monitor
-            server.monitor = test_monitor
-            
-            response = client.get('/auth/browser/status')
-            data = response.get_json()
-            print(f"  Response: {json.dumps(data)}")
-            assert data == {'authenticated': True, 'method': 'browser'}
-            print("  ✓ Correct - authenticated with browser method")
-            
-            server.monitor = original_monitor
-            
-        print("\n" + "=" * 60)
-        print("✅ All status API behaviors work correctly")
-        print("=" * 60)
-        return True
-        
-    except Exception as e:
-        print(f"\n✗ ERROR: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-
-def main():
-    """Run integration tests"""
-    print("=" * 60)
-    print("BROWSER AUTH BUTTON FIX - INTEGRATION TEST")
-    print("=" * 60)
+    # Simulate what happens when button is clicked
+    # We manually set browser_auth like the fixed code does BEFORE starting the thread
+    monkeypatch.setattr(server, 'browser_auth', ring_browser_auth.RingBrowserAuth(headless=False))
     
-    tests = [
-        ("Bug Scenario Simulation", test_button_click_scenario),
-        ("Status API Behavior", test_status_api_behavior),
-    ]
+    # Now check status - it should show browser_active: true
+    response = client.get('/auth/browser/status')
+    data = response.get_json()
     
-    results = []
-    for name, test_func in tests:
-        result = test_func()
-        results.append((name, result))
+    # Verify the fix
+    assert data['authenticated'] == False, "Should not be authenticated yet"
+    assert data['browser_active'] == True, "Browser should be active!"
+
+
+def test_status_api_behavior(client, blank_monitor, headless_auth, monkeypatch):
+    """Test the complete status API behavior"""
+    # Test 1: No authentication
+    response = client.get('/auth/browser/status')
+    data = response.get_json()
+    assert data == {'authenticated': False, 'browser_active': False}
     
-    print("\n" + "=" * 60)
-    print("FINAL RESULTS")
-    print("=" * 60)
+    # Test 2: Browser active (button clicked)
+    monkeypatch.setattr(server, 'browser_auth', headless_auth)
+    response = client.get('/auth/browser/status')
+    data = response.get_json()
+    assert data == {'authenticated': False, 'browser_active': True}
+    monkeypatch.setattr(server, 'browser_auth', None)
     
-    all_passed = True
-    for name, result in results:
-        status = "✓ PASSED" if result else "✗ FAILED"
-        print(f"{status}: {name}")
-        if not result:
-            all_passed = False
+    # Test 3: Monitor authenticated
+    monkeypatch.setattr(blank_monitor, 'ring', object())  # Mock authenticated
+    monkeypatch.setattr(server, 'monitor', blank_monitor)
     
-    if all_passed:
-        print("\n✅ All integration tests passed!")
-        print("\nThe fix ensures:")
-        print("  1. browser_auth is set BEFORE the thread starts")
-        print("  2. Status endpoint can immediately see browser_active: true")
-        print("  3. UI polling works correctly and shows progress")
-        print("  4. No more 'does nothing' behavior!")
-        return 0
-    else:
-        print("\n❌ Some tests failed!")
-        return 1
-
-
-if __name__ == "__main__":
-    sys.exit(main())
+    response = client.get('/auth/browser/status')
+    data = response.get_json()
+    assert data == {'authenticated': True, 'method': 'browser'}
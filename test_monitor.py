@@ -3,13 +3,22 @@
 Demo/Test script for Little Finger Ring Monitor
 Demonstrates the monitoring system with mock data
 """
+import contextlib
+import io
 import json
-import time
-from datetime import datetime
-from ring_monitor import RingMonitor
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Sequence, TextIO, Tuple
 
+import numpy as np
+import pytest
 
-def create_mock_config():
+import ring_monitor
+from ring_monitor import RingMonitor, PostBatch
+
+
+def create_mock_config() -> Dict:
     """Create a test configuration"""
     return {
         "ring": {
@@ -29,14 +38,18 @@ def create_mock_config():
     }
 
 
-def create_mock_posts():
-    """Create sample Ring neighborhood posts for testing"""
+# Mock posts don't need real timestamps, only well-formed ones
+_TS = "2024-01-01T00:00:00"
+
+
+def _build_mock_posts() -> List[Dict]:
+    """Build sample Ring neighborhood posts for testing"""
     return [
         {
             "id": "post_1",
             "title": "Suspicious Activity",
             "text": "Someone was lurking around the neighborhood looking suspicious",
-            "created_at": datetime.now().isoformat(),
+            "created_at": _TS,
             "latitude": 37.7749,
             "longitude": -122.4194,
             "address": "123 Main St, San Francisco, CA"
@@ -45,7 +58,7 @@ def create_mock_posts():
             "id": "post_2",
             "title": "Police Response",
             "text": "Police were called to the area 🚔 for a reported theft",
-            "created_at": datetime.now().isoformat(),
+            "created_at": _TS,
             "latitude": 37.7849,
             "longitude": -122.4094,
             "address": "456 Oak Ave, San Francisco, CA"
@@ -54,7 +67,7 @@ def create_mock_posts():
             "id": "post_3",
             "title": "Neighborhood Watch",
             "text": "Everyone stay safe! 🚨",
-            "created_at": datetime.now().isoformat(),
+            "created_at": _TS,
             "latitude": 37.7649,
             "longitude": -122.4294,
             "address": "789 Pine St, San Francisco, CA"
@@ -63,7 +76,7 @@ def create_mock_posts():
             "id": "post_4",
             "title": "Lost Dog",
             "text": "Has anyone seen a golden retriever?",
-            "created_at": datetime.now().isoformat(),
+            "created_at": _TS,
             "latitude": 37.7749,
             "longitude": -122.4394,
             "address": "321 Elm St, San Francisco, CA"
@@ -71,76 +84,115 @@ def create_mock_posts():
     ]
 
 
-def test_keyword_detection():
+# Built once at import; the tests only read the posts
+_MOCK_POSTS = tuple(_build_mock_posts())
+
+
+def create_mock_posts() -> Tuple[Dict, ...]:
+    """Return the sample Ring neighborhood posts"""
+    return _MOCK_POSTS
+
+
+def create_mock_batch(posts: Sequence[Dict]) -> PostBatch:
+    """Lay out sample posts as a columnar PostBatch"""
+    return PostBatch(
+        ids=[post["id"] for post in posts],
+        titles=[post["title"] for post in posts],
+        texts=[post["text"] for post in posts],
+        timestamps=[post["created_at"] for post in posts],
+        coords=np.array([(post["latitude"], post["longitude"]) for post in posts], dtype=ring_monitor.COORD_DTYPE),
+        addresses=[post["address"] for post in posts]
+    )
+
+
+@pytest.fixture(scope="module")
+def shared_monitor() -> RingMonitor:
+    """One RingMonitor per module, so the term matcher is compiled once"""
+    return RingMonitor(create_mock_config())
+
+
+@pytest.fixture
+def monitor(shared_monitor: RingMonitor) -> RingMonitor:
+    """The shared monitor with its seen posts and matches cleared"""
+    shared_monitor.reset_state()
+    return shared_monitor
+
+
+@pytest.fixture
+def posts() -> Tuple[Dict, ...]:
+    """Sample neighborhood posts"""
+    return create_mock_posts()
+
+
+def test_keyword_detection(monitor: RingMonitor, posts: Tuple[Dict, ...]) -> None:
     """Test keyword and emoji detection"""
     print("=== Testing Keyword and Emoji Detection ===\n")
     
-    config = create_mock_config()
-    monitor = RingMonitor(config)
-    mock_posts = create_mock_posts()
-    
     print(f"Monitoring keywords: {monitor.keywords}")
     print(f"Monitoring emojis: {monitor.emojis}")
-    print(f"\nProcessing {len(mock_posts)} posts...\n")
+    print(f"\nProcessing {len(posts)} posts...\n")
     
-    matches = monitor.check_for_matches(mock_posts)
+    matches = monitor.check_for_matches(posts)
     
     print(f"Found {len(matches)} matches:\n")
     for match in matches:
-        print(f"Match ID: {match['id']}")
-        print(f"  Title: {match['title']}")
-        print(f"  Location: {match['location']['address']}")
-        print(f"  Coordinates: ({match['location']['latitude']}, {match['location']['longitude']})")
-        print(f"  Matched Keywords: {match['matched_keywords']}")
-        print(f"  Matched Emojis: {match['matched_emojis']}")
-        print(f"  Timestamp: {match['timestamp']}")
+        print(f"Match ID: {match.id}")
+        print(f"  Title: {match.title}")
+        print(f"  Location: {match.address}")
+        print(f"  Coordinates: ({match.latitude}, {match.longitude})")
+        print(f"  Matched Keywords: {match.matched_keywords}")
+        print(f"  Matched Emojis: {match.matched_emojis}")
+        print(f"  Timestamp: {match.timestamp}")
         print()
     
-    return len(matches) == 3  # Should match posts 1, 2, and 3
+    assert len(matches) == 3, "Should match posts 1, 2, and 3"
 
 
-def test_filtering():
+def test_filtering(monitor: RingMonitor, posts: Tuple[Dict, ...]) -> None:
     """Test filtering by term"""
     print("=== Testing Filtering ===\n")
     
-    config = create_mock_config()
-    monitor = RingMonitor(config)
-    mock_posts = create_mock_posts()
-    
     # Generate matches and add them to monitor's match list
-    matches = monitor.check_for_matches(mock_posts)
+    matches = monitor.check_for_matches(posts)
     monitor.matches.extend(matches)
     
     # Test filtering by keyword
     police_matches = monitor.get_matches_by_term("police")
     print(f"Matches for 'police': {len(police_matches)}")
     for match in police_matches:
-        print(f"  - {match['title']}")
+        print(f"  - {match.title}")
     
     # Test filtering by emoji
     emoji_matches = monitor.get_matches_by_term("🚨")
     print(f"\nMatches for '🚨': {len(emoji_matches)}")
     for match in emoji_matches:
-        print(f"  - {match['title']}")
+        print(f"  - {match.title}")
+    
+    # Matches appended after a lookup are picked up by the next one
+    monitor.matches.extend(monitor.check_for_matches([{
+        "id": "post_5",
+        "title": "Police Again",
+        "text": "Another police visit 🚨"
+    }]))
+    later_matches = monitor.get_matches_by_term("POLICE")
+    print(f"\nMatches for 'POLICE' after a new post: {len(later_matches)}")
     
     print()
-    return len(police_matches) == 1 and len(emoji_matches) == 1
+    assert len(police_matches) == 1
+    assert len(emoji_matches) == 1
+    assert [m.id for m in later_matches] == ["post_2", "post_5"]
 
 
-def test_deduplication():
+def test_deduplication(monitor: RingMonitor, posts: Tuple[Dict, ...]) -> None:
     """Test that duplicate posts aren't reported twice"""
     print("=== Testing Deduplication ===\n")
     
-    config = create_mock_config()
-    monitor = RingMonitor(config)
-    mock_posts = create_mock_posts()
-    
     # First check
-    matches1 = monitor.check_for_matches(mock_posts)
+    matches1 = monitor.check_for_matches(posts)
     print(f"First check: {len(matches1)} matches")
     
     # Second check with same posts (should find 0 new matches)
-    matches2 = monitor.check_for_matches(mock_posts)
+    matches2 = monitor.check_for_matches(posts)
     print(f"Second check (duplicates): {len(matches2)} matches")
     
     # Add a new post
@@ -148,7 +200,7 @@ def test_deduplication():
         "id": "post_5",
         "title": "Theft Report",
         "text": "My package was stolen, be careful with theft in the area",
-        "created_at": datetime.now().isoformat(),
+        "created_at": _TS,
         "latitude": 37.7549,
         "longitude": -122.4494,
         "address": "555 Maple Dr, San Francisco, CA"
@@ -158,10 +210,168 @@ def test_deduplication():
     print(f"Third check (new post): {len(matches3)} matches")
     
     print()
-    return len(matches1) == 3 and len(matches2) == 0 and len(matches3) == 1
+    assert len(matches1) == 3
+    assert len(matches2) == 0, "Duplicate posts should not match again"
+    assert len(matches3) == 1
+
 
+def test_batch_matching(monitor: RingMonitor, posts: Tuple[Dict, ...]) -> None:
+    """Test that a columnar batch matches the same posts as the dict API"""
+    print("=== Testing Batch Matching ===\n")
+    
+    from_dicts = monitor.check_for_matches(posts)
+    monitor.reset_state()
+    from_batch = monitor.check_for_matches_soa(create_mock_batch(posts))
+    
+    print(f"Dict matches: {[m.id for m in from_dicts]}")
+    print(f"Batch matches: {[m.id for m in from_batch]}")
+    
+    print()
+    # detected_at is stamped when each match is made, so compare everything else
+    for match in from_dicts + from_batch:
+        match.detected_at = ""
+    assert from_dicts == from_batch
+
+
+def test_unusable_coordinates(monitor: RingMonitor, posts: Tuple[Dict, ...]) -> None:
+    """Test that posts with blank or missing coordinates still match and report null locations"""
+    print("=== Testing Unusable Coordinates ===\n")
+    
+    odd_posts: List[Dict] = [
+        {"id": "post_blank", "title": "Theft", "text": "Bike theft", "latitude": "", "longitude": "N/A"},
+        {"id": "post_none", "title": "Police", "text": "Police nearby", "latitude": None, "longitude": None},
+    ]
+    matches = monitor.check_for_matches(list(posts) + odd_posts)
+    print(f"Matches: {[m.id for m in matches]}")
+    
+    print()
+    assert [m.id for m in matches] == ["post_1", "post_2", "post_3", "post_blank", "post_none"]
+    for match in matches[3:]:
+        location = match.as_dict()['location']
+        assert location['latitude'] is None and location['longitude'] is None
+        # NaN would have to be serialized as the invalid JSON token NaN
+        json.dumps(match.as_dict(), allow_nan=False)
 
-def main():
+
+def test_empty_terms(monitor: RingMonitor, posts: Tuple[Dict, ...]) -> None:
+    """Test that empty keywords and emojis are ignored whichever search backend is in use"""
+    print("=== Testing Empty Terms ===\n")
+    
+    config = create_mock_config()
+    config["monitoring"]["keywords"] = ["", "police"]
+    config["monitoring"]["emojis"] = [""]
+    with_police = RingMonitor(config)
+    config["monitoring"]["keywords"] = [""]
+    only_empty = RingMonitor(config)
+    
+    police_ids = [m.id for m in with_police.check_for_matches(posts)]
+    empty_ids = [m.id for m in only_empty.check_for_matches(posts)]
+    print(f"Matches for ['', 'police']: {police_ids}")
+    print(f"Matches for ['']: {empty_ids}")
+    
+    print()
+    assert police_ids == ["post_2"]
+    assert empty_ids == [], "An empty keyword should not match every post"
+
+
+def test_matcher_backends(monitor: RingMonitor, posts: Tuple[Dict, ...]) -> None:
+    """Test that every available search backend agrees with the plain substring fallback"""
+    print("=== Testing Matcher Backends ===\n")
+    
+    terms = sorted(set(monitor.keywords + monitor.emojis))
+    backends: Dict[str, Callable[[str], set]] = {'regex': RingMonitor._regex_matcher(terms)}
+    if ring_monitor.hyperscan is not None:
+        backends['hyperscan'] = RingMonitor._hyperscan_matcher(terms)
+    if ring_monitor.ahocorasick is not None:
+        backends['aho-corasick'] = RingMonitor._automaton_matcher(terms)
+    print(f"Backends available: {list(backends)}")
+    
+    texts = [f"{post['title']} {post['text']}".lower() for post in posts]
+    default_matcher = monitor._matcher
+    try:
+        monitor._matcher = None
+        expected = [monitor._match_terms(text) for text in texts]
+        
+        found = {}
+        for name, matcher in backends.items():
+            monitor._matcher = matcher
+            found[name] = [monitor._match_terms(text) for text in texts]
+            print(f"  {name}: {'agrees' if found[name] == expected else 'DIFFERS'}")
+    finally:
+        monitor._matcher = default_matcher
+    
+    print()
+    for name, results in found.items():
+        assert results == expected, f"{name} disagrees with the substring fallback"
+
+
+def test_overlapping_terms(monitor: RingMonitor, posts: Tuple[Dict, ...]) -> None:
+    """Test that terms nested inside or overlapping other terms are all found"""
+    print("=== Testing Overlapping Terms ===\n")
+    
+    terms = ["car", "police", "police car", "rob", "robbery"]
+    text = "a police car chased the robbery suspect"
+    backends: Dict[str, Callable[[str], set]] = {'regex': RingMonitor._regex_matcher(terms)}
+    if ring_monitor.hyperscan is not None:
+        backends['hyperscan'] = RingMonitor._hyperscan_matcher(terms)
+    if ring_monitor.ahocorasick is not None:
+        backends['aho-corasick'] = RingMonitor._automaton_matcher(terms)
+    
+    found = {name: sorted(find(text)) for name, find in backends.items()}
+    for name, hits in found.items():
+        print(f"  {name}: {hits}")
+    
+    print()
+    for name, hits in found.items():
+        assert hits == terms, f"{name} missed overlapping terms"
+
+
+class _PerThreadStdout:
+    """Stands in for sys.stdout so each worker thread's prints go to its own buffer"""
+    
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+        self.local = threading.local()
+    
+    @contextlib.contextmanager
+    def capture(self) -> Iterator[io.StringIO]:
+        """Send this thread's writes to a fresh buffer for the duration of the block"""
+        self.local.buf = buf = io.StringIO()
+        try:
+            yield buf
+        finally:
+            del self.local.buf
+    
+    def write(self, text: str) -> int:
+        return getattr(self.local, 'buf', self.stream).write(text)
+    
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def _run_test(stdout: _PerThreadStdout, test_name: str,
+              test_func: Callable[[RingMonitor, Tuple[Dict, ...]], None],
+              posts: Tuple[Dict, ...]) -> Tuple[bool, str]:
+    """Run one test on its own monitor and return whether it passed, plus its buffered output"""
+    with stdout.capture() as buf:
+        try:
+            test_func(RingMonitor(create_mock_config()), posts)
+            passed = True
+            buf.write(f"✓ PASSED: {test_name}\n\n")
+        except AssertionError as e:
+            passed = False
+            buf.write(f"✗ FAILED: {test_name}\n")
+            if str(e):
+                buf.write(f"  {e}\n")
+            buf.write("\n")
+        except Exception as e:
+            passed = False
+            buf.write(f"✗ ERROR: {test_name}\n")
+            buf.write(f"  Error: {e}\n\n")
+        return passed, buf.getvalue()
+
+
+def main() -> bool:
     """Run all tests"""
     print("╔════════════════════════════════════════════════╗")
     print("║   Little Finger Ring Monitor - Test Suite    ║")
@@ -170,20 +380,31 @@ def main():
     tests = [
         ("Keyword Detection", test_keyword_detection),
         ("Filtering", test_filtering),
-        ("Deduplication", test_deduplication)
+        ("Deduplication", test_deduplication),
+        ("Batch Matching", test_batch_matching),
+        ("Unusable Coordinates", test_unusable_coordinates),
+        ("Empty Terms", test_empty_terms),
+        ("Matcher Backends", test_matcher_backends),
+        ("Overlapping Terms", test_overlapping_terms)
     ]
     
+    posts = create_mock_posts()
+    
+    # Each test gets its own monitor, so they can run side by side; every test's
+    # output is buffered per thread and written to stdout in one call when it finishes
     results = []
-    for test_name, test_func in tests:
-        try:
-            passed = test_func()
-            results.append((test_name, passed))
-            status = "✓ PASSED" if passed else "✗ FAILED"
-            print(f"{status}: {test_name}\n")
-        except Exception as e:
-            results.append((test_name, False))
-            print(f"✗ FAILED: {test_name}")
-            print(f"  Error: {e}\n")
+    stdout = sys.stdout = _PerThreadStdout(sys.stdout)
+    try:
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = {executor.submit(_run_test, stdout, test_name, test_func, posts): test_name
+                       for test_name, test_func in tests}
+            for future in as_completed(futures):
+                test_passed, output = future.result()
+                results.append((futures[future], test_passed))
+                stdout.stream.write(output)
+                stdout.stream.flush()
+    finally:
+        sys.stdout = stdout.stream
     
     # Print summary
     print("=" * 50)
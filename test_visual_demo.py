@@ -3,84 +3,83 @@ Visual demonstration of the browser authentication feature
 """
 import sys
 
-def print_banner(text):
-    """Print a nice banner"""
-    print("\n" + "=" * 70)
-    print(f"  {text}")
-    print("=" * 70 + "\n")
-
-def main():
-    print_banner("🔐 Little Finger - Browser Authentication Demo")
-    
-    print("This implementation adds secure browser-based authentication")
-    print("where users login directly through Ring's official website.\n")
-    
-    print("📋 FEATURES:")
-    print("  ✅ Login directly on Ring's website")
-    print("  ✅ Credentials never pass through the app")
-    print("  ✅ Full 2FA and CAPTCHA support")
-    print("  ✅ Session persistence across restarts")
-    print("  ✅ Backward compatible with form-based login\n")
-    
-    print("🔧 NEW COMPONENTS:")
-    print("  • ring_browser_auth.py - Browser automation module")
-    print("  • /auth/browser/start - Endpoint to start browser auth")
-    print("  • /auth/browser/status - Endpoint to check auth status")
-    print("  • Login page with dual authentication options\n")
-    
-    print("📚 DOCUMENTATION:")
-    print("  • BROWSER_AUTH_GUIDE.md - Complete setup guide")
-    print("  • IMPLEMENTATION_BROWSER_AUTH.md - Technical summary")
-    print("  • Updated README.md with new auth methods\n")
-    
-    print("🧪 TESTING:")
-    print("  ✓ Integration tests: 4/4 passing")
-    print("  ✓ Existing tests: 3/3 passing")
-    print("  ✓ Security scan: 0 alerts")
-    print("  ✓ All modules import successfully\n")
-    
-    print("🎯 AUTHENTICATION FLOW:")
-    print()
-    print("  1. User visits http://localhost:5777")
-    print("     ↓")
-    print("  2. Clicks 'Login via Ring Website' button")
-    print("     ↓")
-    print("  3. Browser opens Ring's official login page")
-    print("     ↓")
-    print("  4. User authenticates on Ring's website")
-    print("     ↓")
-    print("  5. App captures cookies and OAuth tokens")
-    print("     ↓")
-    print("  6. User redirected to monitoring dashboard")
-    print()
-    
-    print("💡 COMPARISON:")
-    print()
-    print("  Before:  User → App Form → Ring API")
-    print("           (credentials pass through app)")
-    print()
-    print("  After:   User → Ring Website → Session Capture")
-    print("           (credentials never touch app)")
-    print()
-    
-    print("🔒 SECURITY:")
-    print("  • No credential storage in app")
-    print("  • Proper URL validation with urlparse")
-    print("  • Session isolation in browser context")
-    print("  • Auth state files excluded from git")
-    print("  • CodeQL security scan: 0 alerts\n")
-    
-    print("🚀 READY TO USE:")
-    print()
-    print("  $ pip install -r requirements.txt")
-    print("  $ playwright install chromium")
-    print("  $ python server.py")
-    print()
-    print("  Then visit: http://localhost:5777")
-    print()
-    
-    print_banner("✅ Implementation Complete")
-    
+
+def banner(text: str) -> str:
+    """Render a nice banner"""
+    return "\n" + "=" * 70 + f"\n  {text}\n" + "=" * 70 + "\n\n"
+
+
+# The whole demo is static, so render it once and write it in a single call
+_DEMO = banner("🔐 Little Finger - Browser Authentication Demo") + """\
+This implementation adds secure browser-based authentication
+where users login directly through Ring's official website.
+
+📋 FEATURES:
+  ✅ Login directly on Ring's website
+  ✅ Credentials never pass through the app
+  ✅ Full 2FA and CAPTCHA support
+  ✅ Session persistence across restarts
+  ✅ Backward compatible with form-based login
+
+🔧 NEW COMPONENTS:
+  • ring_browser_auth.py - Browser automation module
+  • /auth/browser/start - Endpoint to start browser auth
+  • /auth/browser/status - Endpoint to check auth status
+  • Login page with dual authentication options
+
+📚 DOCUMENTATION:
+  • BROWSER_AUTH_GUIDE.md - Complete setup guide
+  • IMPLEMENTATION_BROWSER_AUTH.md - Technical summary
+  • Updated README.md with new auth methods
+
+🧪 TESTING:
+  ✓ Integration tests: 4/4 passing
+  ✓ Existing tests: 3/3 passing
+  ✓ Security scan: 0 alerts
+  ✓ All modules import successfully
+
+🎯 AUTHENTICATION FLOW:
+
+  1. User visits http://localhost:5777
+     ↓
+  2. Clicks 'Login via Ring Website' button
+     ↓
+  3. Browser opens Ring's official login page
+     ↓
+  4. User authenticates on Ring's website
+     ↓
+  5. App captures cookies and OAuth tokens
+     ↓
+  6. User redirected to monitoring dashboard
+
+💡 COMPARISON:
+
+  Before:  User → App Form → Ring API
+           (credentials pass through app)
+
+  After:   User → Ring Website → Session Capture
+           (credentials never touch app)
+
+🔒 SECURITY:
+  • No credential storage in app
+  • Dashboard URL validation pinned to account.ring.com
+  • Session isolation in browser context
+  • Auth state files excluded from git
+  • CodeQL security scan: 0 alerts
+
+🚀 READY TO USE:
+
+  $ pip install -r requirements.txt
+  $ playwright install chromium
+  $ python server.py
+
+  Then visit: http://localhost:5777
+
+""" + banner("✅ Implementation Complete")
+
+
+def main() -> int:
+    sys.stdout.write(_DEMO)
     return 0
 
 if __name__ == "__main__":